@@ -11,33 +11,66 @@ features
 of the audio signal using the librosa library.
 """
 
+import os
+
+# numba sizes its thread pool when first imported (by librosa); with
+# the process pool every worker would otherwise start one thread per
+# core for pYIN's kernels.
+os.environ.setdefault('NUMBA_NUM_THREADS', '1')
+
+import argparse
+import glob
+import json
 import librosa
+import multiprocessing
 import numpy as np
-import os
+import scipy.fft
+import scipy.signal
+import soundfile as sf
+import sqlite3
+import sys
 import warnings
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, nullcontext
+from dataclasses import asdict, dataclass, field, fields, replace
+from functools import partial
+from math import gcd
+from typing import Optional
 
-#
-# Threshold Configuration
-# These values are a starting point and may require empirical tuning
-# on your specific dataset.
-THRESHOLDS = {
+try:
+    import soxr
+except ImportError:
+    soxr = None
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    threadpool_limits = None
+
+@dataclass(slots=True)
+class Thresholds:
+    """
+    Threshold Configuration
+    These values are a starting point and may require empirical tuning
+    on your specific dataset.
+    """
     # Spectral Flatness
     # A value close to 1.0 is characteristic of white noise.
     # A value close to 0 is characteristic of tonal signals (music).
-    'spectral flatness max': 0.05,
+    spectral_flatness_max: float = 0.05
 
     # Onsets Per Second
     # Music usually has a distinct rhythmic structure.
     # This sets the minimum number of "beats" or "note attacks" per
     # second.
-    'onsets_per_second_min': 1.0,
+    onsets_per_second_min: float = 1.0
 
     # Voiced Frames Ratio
     # The PYIN algorithm determines if an audio frame has a specific
     # pitch (f0).
     # Noise is atonal, so the ratio of voiced frames will be low.
-    'voiced_frames_ratio_min': 0.10,  # 10% of frames should have a
-                                      # detectable pitch
+    voiced_frames_ratio_min: float = 0.10  # 10% of frames should have a
+                                           # detectable pitch
 
     # Chroma Features Standard Deviation
     # A chromagram shows energy distribution across the 12 musical
@@ -45,159 +78,898 @@ THRESHOLDS = {
     # In music, this distribution changes constantly (high standard
     # deviation).
     # In noise, it's more stable (low standard deviation).
-    'chroma std min': 0.30,
+    chroma_std_min: float = 0.30
 
     # Decision Score Threshold
     # How many of the above criteria must be met to classify the
     # recording as likely containing music.
-    'decision_score_min': 2
-}
+    decision_score_min: int = 2
+
+THRESHOLDS = Thresholds()
 
-def analyze_audio_features(file_path: str) -> dict:
+@dataclass(slots=True)
+class Metrics:
     """
-    Analyzes a single audio file and extracts a set of numerical
-    metrics.
+    Numerical metrics extracted from an audio file by
+    analyze_audio_features. A metric is None while it has not been
+    computed (voiced_frames_ratio stays None when pitch detection is
+    skipped).
+    """
+    duration: float
+    spectral_flatness_mean: Optional[float] = None
+    chroma_std_mean: Optional[float] = None
+    onset_count: Optional[int] = None
+    onsets_per_second: Optional[float] = None
+    voiced_frames_ratio: Optional[float] = None
+
+# Analysis Sample Rate
+# Every file is resampled to this rate at load time. The highest
+# frequency of interest is the pitch detection limit C7 (~2093 Hz),
+# far below the 11025 Hz Nyquist frequency of 22050 Hz, so 44.1/48 kHz
+# sources can be halved without losing anything the features use.
+SAMPLE_RATE = 22050
+
+# STFT Configuration
+# Frame and hop size (in samples) of the magnitude spectrogram shared
+# by the spectral, tonal and rhythmic features.
+N_FFT = 2048
+HOP_LENGTH = 512
+
+# Voicing Backend
+# Algorithm measuring the ratio of voiced (pitched) frames:
+#   'pyin'          - librosa's probabilistic YIN (most accurate,
+#                     slowest because of its Viterbi decoding)
+#   'yin'           - YIN aperiodicity threshold, without any decoding
+#   'autocorr_peak' - peak of the normalized autocorrelation per frame
+#   'crepe'         - torchcrepe 'tiny' model, on the GPU when one is
+#                     available (pip install torchcrepe)
+# The backends are not interchangeable: voiced_frames_ratio_min is
+# tuned for 'pyin', which also flags 15-42% of pure noise frames as
+# voiced, while 'yin' and 'autocorr_peak' flag none of them (and miss
+# tones buried deeper in noise).
+VOICING_BACKENDS = ('pyin', 'yin', 'autocorr_peak', 'crepe')
+VOICING_BACKEND = 'pyin'
+
+# Streaming Analysis
+# Only the first ANALYSIS_SECONDS of a file are analyzed, read in
+# blocks of BLOCK_SECONDS overlapping by BLOCK_OVERLAP_SECONDS. Once
+# the verdict no longer depends on pitch detection and at least
+# EARLY_EXIT_MIN_SECONDS have been analyzed, the rest is skipped.
+ANALYSIS_SECONDS = 60
+BLOCK_SECONDS = 10
+BLOCK_OVERLAP_SECONDS = 1
+EARLY_EXIT_MIN_SECONDS = 20
+
+# Metrics Cache
+# The metrics of every analyzed file are cached on disk, keyed by its
+# path, modification time and size, so that re-running the filter over
+# the same archive (e.g. with tuned thresholds) is instant. Records are
+# only reused by the same analysis: bump ANALYSIS_VERSION whenever the
+# feature extraction changes (the analysis constants and the voicing
+# backend are part of the key as well).
+CACHE_PATH = os.path.expanduser('~/.cache/static_archeology/metrics.db')
+ANALYSIS_VERSION = 1
+
+# Number of threads used by scipy.fft, which librosa and the voicing
+# backends use for all their FFTs (-1: one per CPU core). The worker
+# processes of the process pool set it to 1, since the pool already
+# keeps every core busy.
+_fft_workers = -1
+
+# Pitch range searched by every voicing backend.
+PITCH_FMIN = librosa.note_to_hz('C2')
+PITCH_FMAX = librosa.note_to_hz('C7')
+PITCH_FRAME_LENGTH = 2048  # Long frames for better low-frequency
+                           # capture
+
+# Number of frames the 'yin' and 'autocorr_peak' backends process at
+# once, bounding the size of their FFT buffers on long recordings.
+VOICING_BLOCK_FRAMES = 256
+
+def _score_bounds(metrics: Metrics, thresholds: Thresholds) -> tuple:
+    """
+    Computes the lowest and highest decision score still reachable
+    from a (possibly partial) set of metrics.
+    Checks whose metric has not been computed yet count as failed for
+    the lower bound and as passed for the upper bound.
     Args:
-        file_path (str): Path to the audio file (MP3, WAV, etc.).
+        metrics (Metrics): Metrics computed so far.
+        thresholds (Thresholds): The threshold values.
     Returns:
-        dict: A dictionary containing the calculated metrics.
+        tuple: (minimum possible score, maximum possible score).
     """
-    if not os.path.exists(file_path):
-        print(f"File not found: {file_path}")
-        return None
+    checks = [
+        (metrics.spectral_flatness_mean,
+         lambda v: v < thresholds.spectral_flatness_max),
+        (metrics.onsets_per_second,
+         lambda v: v > thresholds.onsets_per_second_min),
+        (metrics.voiced_frames_ratio,
+         lambda v: v > thresholds.voiced_frames_ratio_min),
+        (metrics.chroma_std_mean,
+         lambda v: v > thresholds.chroma_std_min),
+    ]
+    min_score = 0
+    unknown = 0
+    for value, passes in checks:
+        if value is None:
+            unknown += 1
+        elif passes(value):
+            min_score += 1
+    return min_score, min_score + unknown
+
+def _resample(y: np.ndarray, sr_orig: int, sr_target: int) -> np.ndarray:
+    """
+    Resamples a mono signal, with soxr when it is installed and with
+    scipy's polyphase filter otherwise.
+    """
+    if soxr is not None:
+        return soxr.resample(y, sr_orig, sr_target, quality='HQ')
+    factor = gcd(sr_orig, sr_target)
+    return scipy.signal.resample_poly(
+        y, sr_target // factor, sr_orig // factor).astype(np.float32)
+
+def _frame_signal(y: np.ndarray, frame_length: int) -> np.ndarray:
+    """
+    Splits a signal into centered frames of frame_length samples with
+    a hop of frame_length // 4 (the framing used by librosa's pitch
+    trackers).
+    Returns:
+        np.ndarray: Frames as columns, shape (frame_length, n_frames).
+    """
+    y = np.pad(y, frame_length // 2)
+    return librosa.util.frame(y, frame_length=frame_length,
+                              hop_length=frame_length // 4)
+
+def _flags_blockwise(frames: np.ndarray, block_flags) -> np.ndarray:
+    """
+    Applies block_flags to consecutive blocks of VOICING_BLOCK_FRAMES
+    frames and writes the results into one preallocated array, which
+    keeps the FFT buffers of long recordings small and avoids growing
+    the output with repeated concatenations.
+    Args:
+        frames (np.ndarray): Frames as columns.
+        block_flags (callable): Maps a block of frames to one boolean
+                                flag per frame.
+    Returns:
+        np.ndarray: Boolean flag per frame.
+    """
+    n_frames = frames.shape[1]
+    flags = np.empty(n_frames, dtype=bool)
+    for start in range(0, n_frames, VOICING_BLOCK_FRAMES):
+        stop = min(start + VOICING_BLOCK_FRAMES, n_frames)
+        flags[start:stop] = block_flags(frames[:, start:stop])
+    return flags
+
+def _yin_voiced_flags(y: np.ndarray, sr: int,
+                      threshold: float = 0.5) -> np.ndarray:
+    """
+    Flags voiced frames with YIN: a frame is voiced when its cumulative
+    mean normalized difference function dips below the threshold
+    somewhere in the pitch range (silent frames are never voiced). No
+    f0 is decoded.
+    The threshold is far above YIN's usual 0.1, which misses tones at
+    a few dB SNR: 0.5 still finds a tone at 0 dB SNR, while white,
+    pink and brown noise stay unvoiced (up to about 0.6).
+    Returns:
+        np.ndarray: Boolean voiced flag per frame.
+    """
+    frame_length = PITCH_FRAME_LENGTH
+    win_length = frame_length // 2
+    min_period = int(np.floor(sr / PITCH_FMAX))
+    max_period = min(int(np.ceil(sr / PITCH_FMIN)),
+                     frame_length - win_length - 1)
+    taus = np.arange(1, max_period + 1)[:, np.newaxis]
+
+    def block_flags(frames):
+        # Difference function d(tau) = E(0) + E(tau) - 2 * r(tau), with
+        # the autocorrelation r computed by FFT for the whole block.
+        a = scipy.fft.rfft(frames, frame_length, axis=0)
+        b = scipy.fft.rfft(frames[win_length:0:-1], frame_length, axis=0)
+        acf = scipy.fft.irfft(a * b, frame_length, axis=0)[win_length:]
+        energy = np.cumsum(frames**2, axis=0)
+        energy = energy[win_length:] - energy[:-win_length]
+        # Round off FFT and cumulative sum residue, as librosa does.
+        acf[np.abs(acf) < 1e-6] = 0
+        energy[np.abs(energy) < 1e-6] = 0
+        diff = energy[:1] + energy - 2 * acf
+
+        # Cumulative mean normalization
+        cumulative_mean = np.cumsum(diff[1:max_period + 1], axis=0) / taus
+        cmndf = (diff[min_period:max_period + 1] /
+                 (cumulative_mean[min_period - 1:max_period] +
+                  np.finfo(np.float32).tiny))
+        # Silent frames have a zero difference function, so they
+        # need an energy floor not to be flagged as voiced.
+        return (energy[0] > 0) & (cmndf.min(axis=0) < threshold)
+
+    return _flags_blockwise(_frame_signal(y, frame_length), block_flags)
+
+def _autocorr_voiced_flags(y: np.ndarray, sr: int,
+                           threshold: float = 0.5) -> np.ndarray:
+    """
+    Flags voiced frames from the normalized autocorrelation: a frame is
+    voiced when the autocorrelation peak within the pitch range, past
+    its first zero crossing, reaches the threshold (relative to the
+    frame energy).
+    Returns:
+        np.ndarray: Boolean voiced flag per frame.
+    """
+    frame_length = PITCH_FRAME_LENGTH
+    min_period = int(np.floor(sr / PITCH_FMAX))
+    max_period = int(np.ceil(sr / PITCH_FMIN))
+
+    def block_flags(frames):
+        # Zero-padded FFT gives the linear (not circular)
+        # autocorrelation of every frame of the block at once.
+        spectrum = scipy.fft.rfft(frames, 2 * frame_length, axis=0)
+        acf = scipy.fft.irfft(np.abs(spectrum)**2, 2 * frame_length,
+                              axis=0)[:max_period + 1]
+
+        # Only look for the peak after the first zero crossing: before
+        # it the autocorrelation is still decaying from lag 0, which
+        # for low-frequency (colored) noise lasts past min_period. A
+        # frame that never crosses zero in the pitch range is unvoiced.
+        below = acf <= 0
+        first_zero = np.where(below.any(axis=0), below.argmax(axis=0),
+                              len(acf))
+        lags = np.arange(len(acf))[:, np.newaxis]
+        in_range = (lags >= min_period) & (lags >= first_zero)
+        peak = np.where(in_range, acf, -np.inf).max(axis=0)
+        return (acf[0] > 0) & (peak >= threshold * acf[0])
 
-    metrics = {}
+    return _flags_blockwise(_frame_signal(y, frame_length), block_flags)
 
+def _crepe_voiced_flags(y: np.ndarray, sr: int,
+                        threshold: float = 0.5) -> np.ndarray:
+    """
+    Flags voiced frames with the 'tiny' CREPE model of torchcrepe, run
+    on the GPU when one is available. A frame is voiced when its
+    periodicity reaches the threshold.
+    Returns:
+        np.ndarray: Boolean voiced flag per frame.
+    """
+    import torch
+    import torchcrepe
+
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    _, periodicity = torchcrepe.predict(
+        torch.from_numpy(y)[np.newaxis], sr,
+        hop_length=HOP_LENGTH,
+        fmin=PITCH_FMIN,
+        fmax=min(PITCH_FMAX, 2006.),  # CREPE's highest pitch bin
+        model='tiny',
+        decoder=torchcrepe.decode.argmax,
+        return_periodicity=True,
+        batch_size=1024,
+        device=device)
+    return periodicity.cpu().numpy()[0] >= threshold
+
+def voiced_flags(y: np.ndarray, sr: int,
+                 backend: str = VOICING_BACKEND) -> np.ndarray:
+    """
+    Flags the frames (HOP_LENGTH samples apart, centered) where a pitch
+    was confidently detected.
+    Args:
+        y (np.ndarray): Mono audio signal.
+        sr (int): Sampling rate of the signal.
+        backend (str): One of VOICING_BACKENDS.
+    Returns:
+        np.ndarray: Boolean voiced flag per frame.
+    """
+    if backend == 'pyin':
+        f0, voiced_flag, voiced_probs = librosa.pyin(
+            y=y,
+            sr=sr,
+            fmin=PITCH_FMIN,
+            fmax=PITCH_FMAX,
+            frame_length=PITCH_FRAME_LENGTH
+        )
+        return voiced_flag
+    if backend == 'yin':
+        return _yin_voiced_flags(y, sr)
+    if backend == 'autocorr_peak':
+        return _autocorr_voiced_flags(y, sr)
+    if backend == 'crepe':
+        return _crepe_voiced_flags(y, sr)
+    raise ValueError(f"Unknown voicing backend: {backend}")
+
+def voiced_frames_ratio(y: np.ndarray, sr: int,
+                        backend: str = VOICING_BACKEND) -> float:
+    """
+    Computes the ratio of frames where a pitch was confidently
+    detected.
+    Args:
+        y (np.ndarray): Mono audio signal.
+        sr (int): Sampling rate of the signal.
+        backend (str): One of VOICING_BACKENDS.
+    Returns:
+        float: Ratio of voiced frames, between 0 and 1.
+    """
+    voiced_flag = voiced_flags(y, sr, backend)
+    return float(np.mean(voiced_flag)) if len(voiced_flag) > 0 else 0.0
+
+def _read_blocks(file_path: str, duration: float):
+    """
+    Reads the first seconds of an audio file as overlapping blocks of
+    BLOCK_SECONDS, at the file's own sampling rate (SAMPLE_RATE for
+    files loaded by librosa).
+    Files are streamed from libsndfile; formats it cannot read (such as
+    MP3 with older versions) are loaded whole by librosa.load, through
+    audioread/ffmpeg, and split into blocks in memory.
+    Yields:
+        tuple: (The block, its sampling rate, whether it is the last
+                block).
+    """
     try:
-        #1. Load Audio
-        # sr=None preserves the original sampling rate.
-        # duration = 60 limits the analysis to the first 60 seconds for
-        # speed.
-        print(f"\nAnalyzing file: {os.path.basename(file_path)}...")
+        f = sf.SoundFile(file_path)
+    except sf.LibsndfileError:
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
-            y, sr = librosa.load(file_path, sr=None, duration=60)
+            y, sr = librosa.load(file_path, sr=SAMPLE_RATE, mono=True,
+                                 duration=duration, res_type='soxr_hq')
+        step = (BLOCK_SECONDS - BLOCK_OVERLAP_SECONDS) * sr
+        for start in range(0, len(y), step):
+            end = start + BLOCK_SECONDS * sr
+            yield y[start:end], sr, end >= len(y)
+            if end >= len(y):
+                break
+        return
 
-        if len(y) == 0:
-            print("File is empty or could not be read.")
-            return None
+    with f:
+        sr = f.samplerate
+        n_total = min(f.frames, int(duration * sr))
+        step = (BLOCK_SECONDS - BLOCK_OVERLAP_SECONDS) * sr
+        blocks = f.blocks(blocksize=BLOCK_SECONDS * sr,
+                          overlap=BLOCK_OVERLAP_SECONDS * sr,
+                          frames=n_total, dtype='float32')
+        for i, block in enumerate(blocks):
+            yield block, sr, i * step + len(block) >= n_total
 
-        duration = librosa.get_duration(y=y, sr=sr)
-        metrics['duration'] = duration
+def _iter_audio_blocks(file_path: str, duration: float):
+    """
+    Streams the first seconds of an audio file as overlapping mono
+    float32 blocks at SAMPLE_RATE, without holding the whole window in
+    memory.
+    The overlap of two consecutive blocks is split in its middle: each
+    block only accounts for the samples [lo, hi) on its side, so every
+    sample is analyzed exactly once while every block still has
+    context at its edges (for the STFT, onsets and resampling).
+    Args:
+        file_path (str): Path to the audio file.
+        duration (float): Number of seconds to analyze.
+    Yields:
+        tuple: (The block, lo, hi).
+    """
+    step = (BLOCK_SECONDS - BLOCK_OVERLAP_SECONDS) * SAMPLE_RATE
+    half_overlap = BLOCK_OVERLAP_SECONDS * SAMPLE_RATE // 2
+    for i, (y, sr, is_last) in enumerate(_read_blocks(file_path,
+                                                      duration)):
+        if y.ndim > 1:
+            y = y.mean(axis=1, dtype=np.float32)
+        if sr != SAMPLE_RATE:
+            y = _resample(y, sr, SAMPLE_RATE)
+        lo = 0 if i == 0 else half_overlap
+        hi = len(y) if is_last else len(y) - half_overlap
 
-        #2. Spectral Energy Analysis (FFT-based)
-        # Get the magnitude spectrogram
-        S = np.abs(librosa.stft(y))
+        # Trim the start of the block to a multiple of HOP_LENGTH (in
+        # file time), so its frames fall on the same grid as if the
+        # whole file was analyzed at once.
+        skip = -(i * step) % HOP_LENGTH
+        yield y[skip:], lo - skip, hi - skip
 
-        # Spectral Flatness
-        flatness = librosa.feature.spectral_flatness(S=S)
-        metrics['spectral_flatness_mean'] = np.mean(flatness)
+def _owned_frames(lo: int, hi: int) -> slice:
+    """
+    Converts the sample range [lo, hi) of a block to the slice of its
+    (centered, HOP_LENGTH apart) frames whose center falls inside it.
+    """
+    return slice(-(-lo // HOP_LENGTH), -(-hi // HOP_LENGTH))
+
+def _spectral_flatness(power: np.ndarray, amin: float = 1e-10
+                       ) -> np.ndarray:
+    """
+    Computes the spectral flatness (geometric over arithmetic mean of
+    the power) of every frame, like librosa.feature.spectral_flatness,
+    but in place: the float32 power spectrogram is overwritten instead
+    of being copied for every intermediate step.
+    Args:
+        power (np.ndarray): Power spectrogram (overwritten).
+        amin (float): Lower bound of the power, avoiding log(0).
+    Returns:
+        np.ndarray: Spectral flatness per frame.
+    """
+    np.maximum(power, amin, out=power)
+    arithmetic_mean = power.mean(axis=0)
+    np.log(power, out=power)
+    return np.exp(power.mean(axis=0)) / arithmetic_mean
+
+@dataclass
+class _FeatureAccumulator:
+    """
+    Running statistics of the features over the blocks of a file,
+    combined without keeping the blocks or their spectrograms.
+    """
+    n_samples: int = 0
+    n_frames: int = 0
+    flatness_sum: float = 0.0
+    # Per-pitch running mean and sum of squared deviations of the
+    # chromagram (Welford/Chan)
+    chroma_mean: np.ndarray = field(
+        default_factory=lambda: np.zeros(12))
+    chroma_m2: np.ndarray = field(default_factory=lambda: np.zeros(12))
+    onset_envelopes: list = field(default_factory=list)
+    n_voicing_frames: int = 0
+    n_voiced_frames: int = 0
+
+    def add_spectrogram(self, S: np.ndarray, sr: int, frames: slice,
+                        n_samples: int):
+        """
+        Adds the spectral, tonal and rhythmic features of a block.
+        Args:
+            S (np.ndarray): Magnitude spectrogram of the whole block.
+            sr (int): Sampling rate.
+            frames (slice): Frames of S the block accounts for.
+            n_samples (int): Number of samples the block accounts for.
+        """
+        self.n_samples += n_samples
 
         # Chroma Features (Tonal components)
-        chroma = librosa.feature.chroma_stft(S=S, sr=sr)
+        # tuning=0.0 skips librosa's tuning estimation (a full pitch
+        # tracking pass over S): a reference tuning is precise enough
+        # for measuring harmonic diversity. The default per-frame
+        # normalization is kept, as chroma_std_min is relative to it.
+        # The per-pitch mean and variance of the block are merged into
+        # the running ones.
+        chroma = librosa.feature.chroma_stft(S=S, sr=sr, tuning=0.0,
+                                             n_chroma=12)[:, frames]
+        n_a, n_b = self.n_frames, chroma.shape[1]
+        n = n_a + n_b
+        if n_b > 0:
+            mean_b = chroma.mean(axis=1)
+            m2_b = np.sum((chroma - mean_b[:, np.newaxis])**2, axis=1)
+            delta = mean_b - self.chroma_mean
+            self.chroma_mean += delta * n_b / n
+            self.chroma_m2 += m2_b + delta**2 * n_a * n_b / n
+        self.n_frames = n
+
+        # Onset strength envelope
+        # Built from the magnitude spectrogram instead of letting
+        # onset_detect run a second STFT over the signal. Like
+        # onset_detect's default, it uses a log-power mel spectrogram.
+        power = np.square(S)
+        mel = librosa.feature.melspectrogram(S=power, sr=sr)
+        onset_env = librosa.onset.onset_strength(
+            S=librosa.power_to_db(mel), sr=sr)
+        self.onset_envelopes.append(onset_env[frames])
+
+        # Spectral Flatness
+        # Computed last, as it reuses (and overwrites) the power
+        # spectrogram.
+        flatness = _spectral_flatness(power)[frames]
+        self.flatness_sum += float(np.sum(flatness))
+
+    def add_voicing(self, flags: np.ndarray):
+        """
+        Adds the voiced flags of the frames a block accounts for.
+        """
+        self.n_voicing_frames += len(flags)
+        self.n_voiced_frames += int(np.sum(flags))
+
+    def metrics(self, sr: int) -> Metrics:
+        """
+        Returns the metrics of all blocks added so far.
+        """
+        duration = self.n_samples / sr
+        metrics = Metrics(duration=duration)
+        if self.n_frames == 0:
+            return metrics
+
+        metrics.spectral_flatness_mean = self.flatness_sum / self.n_frames
 
         # Calculate the mean standard deviation across all chroma
-        # features.
+        # features (sqrt of the per-pitch variance, same as np.std).
         # A high value suggests harmonic diversity (music).
-        metrics['chroma std mean'] = np.mean(np.std(chroma, axis=1))
-
-        #3. Pitch Detection
-        # Use PYIN to estimate the fundamental frequency (f0)
-        f0, voiced_flag, voiced_probs = librosa.pyin(
-            y=y,
-            sr=sr,
-            fmin=librosa.note_to_hz('C2'),
-            fmax=librosa.note_to_hz('C7'),
-            frame_length=2048  # Increase frame length for better
-                               # low-frequency capture
-        )
-        # Calculate the ratio of frames where a pitch was confidently
-        # detected
-        metrics['voiced_frames_ratio'] = np.sum(voiced_flag) / \
-                                         len(voiced_flag) if len(voiced_flag) > 0 else 0
+        metrics.chroma_std_mean = float(
+            np.sqrt(self.chroma_m2 / self.n_frames).mean())
 
-        #4. Onset Detection
-        onsets = librosa.onset.onset_detect(y=y, sr=sr, units='time')
-        metrics['onset_count'] = len(onsets)
-        metrics['onsets_per_second'] = len(onsets) / duration if \
-                                        duration > 0 else 0
+        # Only the number of onsets is needed: they are kept as frame
+        # indices (no conversion to time) and not backtracked.
+        onsets = librosa.onset.onset_detect(
+            onset_envelope=np.concatenate(self.onset_envelopes), sr=sr,
+            hop_length=HOP_LENGTH, units='frames', backtrack=False)
+        metrics.onset_count = len(onsets)
+        metrics.onsets_per_second = len(onsets) / duration if \
+                                    duration > 0 else 0
 
+        if self.n_voicing_frames > 0:
+            metrics.voiced_frames_ratio = (self.n_voiced_frames /
+                                           self.n_voicing_frames)
         return metrics
 
+def _verdict_decided(metrics: Metrics, thresholds: Thresholds) -> bool:
+    """
+    Tells whether the spectral, tonal and rhythmic checks decide the
+    verdict on their own, whatever the result of pitch detection.
+    """
+    min_score, max_score = _score_bounds(
+        replace(metrics, voiced_frames_ratio=None), thresholds)
+    return (max_score < thresholds.decision_score_min or
+            min_score >= thresholds.decision_score_min)
+
+def _blas_limits(blas_threads: int):
+    """
+    Returns a context manager limiting BLAS to blas_threads threads
+    (a no-op when blas_threads is None or threadpoolctl is missing).
+    """
+    if threadpool_limits is None or blas_threads is None:
+        return nullcontext()
+    return threadpool_limits(limits=blas_threads, user_api='blas')
+
+def _analyze_file(file_path: str, thresholds: Thresholds,
+                  voicing_backend: str, blas_threads: int = None) -> tuple:
+    """
+    Implements analyze_audio_features without printing anything, so it
+    can run in worker processes. BLAS is limited to blas_threads
+    threads during the analysis (None keeps the library default).
+    Returns:
+        tuple: (The metrics or None, the error message or None).
+    """
+    if not os.path.exists(file_path):
+        return None, f"File not found: {file_path}"
+
+    try:
+        sr = SAMPLE_RATE
+        features = _FeatureAccumulator()
+        # Blocks whose pitch detection was skipped, kept in case a
+        # later block needs it (at most ANALYSIS_SECONDS of audio).
+        pending = []
+        detecting_pitch = False
+
+        # All FFTs below (STFT and pitch detection) run on
+        # _fft_workers threads, and BLAS on blas_threads threads.
+        with scipy.fft.set_workers(_fft_workers), \
+                _blas_limits(blas_threads):
+            #1. Load Audio
+            # The audio is downmixed to mono, resampled to SAMPLE_RATE
+            # and read block by block. ANALYSIS_SECONDS limits the
+            # analysis to the beginning of the file for speed.
+            for y, lo, hi in _iter_audio_blocks(file_path,
+                                                ANALYSIS_SECONDS):
+                frames = _owned_frames(lo, hi)
+
+                #2. Spectral Energy Analysis (FFT-based)
+                # Get the magnitude spectrogram
+                # librosa computes it with a real-input FFT
+                # (scipy.fft.rfft); keeping the signal in float32 with
+                # complex64 output avoids a float64 promotion and halves
+                # the spectrogram's memory.
+                S = np.abs(librosa.stft(y.astype(np.float32, copy=False),
+                                        n_fft=N_FFT, hop_length=HOP_LENGTH,
+                                        dtype=np.complex64))
+
+                #3. Spectral, Tonal and Rhythmic Features
+                features.add_spectrogram(S, sr, frames, hi - lo)
+
+                #4. Pitch Detection
+                # Pitch detection is by far the slowest step, so skip it
+                # when the checks above already decide the verdict on
+                # their own, and stop reading the file once that holds
+                # for a long enough excerpt.
+                # Once it runs for a block, it runs for every block, so
+                # that the voiced ratio covers the whole excerpt.
+                pending.append((y, frames))
+                if thresholds is not None:
+                    metrics = features.metrics(sr)
+                    if _verdict_decided(metrics, thresholds):
+                        if metrics.duration >= EARLY_EXIT_MIN_SECONDS:
+                            break
+                        if not detecting_pitch:
+                            continue
+
+                detecting_pitch = True
+                for y_block, frames_block in pending:
+                    features.add_voicing(voiced_flags(
+                        y_block, sr, voicing_backend)[frames_block])
+                pending.clear()
+
+        if features.n_samples == 0:
+            return None, "File is empty or could not be read."
+
+        return features.metrics(sr), None
+
     except Exception as e:
-        print(f"Failed to process file {file_path}. Error: {e}")
-        return None
+        return None, f"Failed to process file {file_path}. Error: {e}"
+
+def analyze_audio_features(file_path: str, thresholds: Thresholds = None,
+                           voicing_backend: str = VOICING_BACKEND
+                           ) -> Metrics:
+    """
+    Analyzes a single audio file and extracts a set of numerical
+    metrics.
+    The file is streamed in overlapping blocks of BLOCK_SECONDS and the
+    metrics are accumulated block by block. When thresholds are given:
+     - pitch detection is skipped as long as the cheap spectral and
+       rhythmic metrics decide the verdict on their own
+       (voiced_frames_ratio stays None if it is never needed); once a
+       block needs it, it is also run on the blocks skipped so far, so
+       the ratio always covers the whole analyzed excerpt;
+     - the analysis stops early once those metrics decide the verdict
+       and at least EARLY_EXIT_MIN_SECONDS have been analyzed.
+    pYIN's Viterbi decoding runs per block, so its voiced_frames_ratio
+    can differ slightly from a whole-window analysis.
+    Args:
+        file_path (str): Path to the audio file (MP3, WAV, etc.).
+        thresholds (Thresholds): Threshold values used for the early
+                                 exit (None always runs every step).
+        voicing_backend (str): Pitch detection algorithm, one of
+                               VOICING_BACKENDS.
+    Returns:
+        Metrics: The calculated metrics.
+    """
+    metrics, error = _analyze_file(file_path, thresholds, voicing_backend)
+    if error is not None:
+        print(error)
+    return metrics
 
-def classify_audio(metrics: dict, thresholds: dict) -> tuple:
+def classify_audio(metrics: Metrics, thresholds: Thresholds,
+                   with_details: bool = True) -> tuple:
     """
     Makes a decision about the presence of music based on metrics and
     thresholds.
     Args:
-        metrics (dict): Dictionary of metrics from
-                        analyze_audio_features.
-        thresholds (dict): Dictionary of threshold values.
+        metrics (Metrics): Metrics from analyze_audio_features.
+        thresholds (Thresholds): The threshold values.
+        with_details (bool): Build the description of every check
+                             (skipped when the report does not show
+                             them).
     Returns:
         tuple: (A string with the decision, the final score, and check
                 details).
     """
-    score = 0
+    flatness_max = thresholds.spectral_flatness_max
+    onsets_min = thresholds.onsets_per_second_min
+    voiced_min = thresholds.voiced_frames_ratio_min
+    chroma_min = thresholds.chroma_std_min
+
+    flatness = metrics.spectral_flatness_mean
+    onsets_ps = metrics.onsets_per_second
+    voiced_ratio = metrics.voiced_frames_ratio
+    chroma_std = metrics.chroma_std_mean
+
+    # A missing ratio means pitch detection was skipped because the
+    # other checks already decided the verdict; it counts as failed.
+    score = ((flatness < flatness_max) + (onsets_ps > onsets_min) +
+             (voiced_ratio is not None and voiced_ratio > voiced_min) +
+             (chroma_std > chroma_min))
+
     details = []
+    if with_details:
+        # Check #1: Spectral Flatness
+        if flatness < flatness_max:
+            details.append(f" [V] Spectrum is tonal "
+                           f"(flatness={flatness:.3f} < {flatness_max})")
+        else:
+            details.append(f" [X] Spectrum is noise-like "
+                           f"(flatness={flatness:.3f} >= {flatness_max})")
 
-    # Check #1: Spectral Flatness
-    flatness = metrics.get('spectral_flatness_mean', 1.0)
-    if flatness < thresholds['spectral flatness max']:
-        score += 1
-        details.append(f" [V] Spectrum is tonal "
-                       f"(flatness={flatness:.3f} < {thresholds['spectral flatness max']})")
-    else:
-        details.append(f" [X] Spectrum is noise-like "
-                       f"(flatness={flatness:.3f} >= {thresholds['spectral flatness max']})")
-
-    # Check #2: Rhythmic Onsets
-    onsets_ps = metrics.get('onsets_per_second', 0)
-    if onsets_ps > thresholds['onsets_per_second_min']:
-        score += 1
-        details.append(f" [V] Rhythm detected ({onsets_ps:.2f} "
-                       f"onsets/sec > {thresholds['onsets_per_second_min']})")
-    else:
-        details.append(f" [X] No rhythm detected ({onsets_ps:.2f} "
-                       f"onsets/sec <= {thresholds['onsets_per_second_min']})")
-
-    # Check #3: Presence of Pitch (Voice/Instruments)
-    voiced_ratio = metrics.get('voiced_frames_ratio', 0)
-    if voiced_ratio > thresholds['voiced_frames_ratio_min']:
-        score += 1
-        details.append(f" [V] Tonal components found "
-                       f"({voiced_ratio:.1%} > {thresholds['voiced_frames_ratio_min']:.0%})")
-    else:
-        details.append(f" [X] Signal is atonal ({voiced_ratio:.1%} <= "
-                       f"{thresholds['voiced_frames_ratio_min']:.0%})")
-
-    # Check #4: Harmonic Diversity
-    chroma_std = metrics.get('chroma std mean', 0)
-    if chroma_std > thresholds['chroma_std_min']:
-        score += 1
-        details.append(f" [V] Harmonic development found "
-                       f"(chroma_std={chroma_std:.3f} > {thresholds['chroma_std_min']})")
-    else:
-        details.append(f" [X] No harmonic development "
-                       f"(chroma_std={chroma_std:.3f} "
-                       f"<= {thresholds['chroma_std_min']})")
+        # Check #2: Rhythmic Onsets
+        if onsets_ps > onsets_min:
+            details.append(f" [V] Rhythm detected ({onsets_ps:.2f} "
+                           f"onsets/sec > {onsets_min})")
+        else:
+            details.append(f" [X] No rhythm detected ({onsets_ps:.2f} "
+                           f"onsets/sec <= {onsets_min})")
+
+        # Check #3: Presence of Pitch (Voice/Instruments)
+        if voiced_ratio is None:
+            details.append(" [?] Pitch detection skipped (verdict "
+                           "decided by the other checks)")
+        elif voiced_ratio > voiced_min:
+            details.append(f" [V] Tonal components found "
+                           f"({voiced_ratio:.1%} > {voiced_min:.0%})")
+        else:
+            details.append(f" [X] Signal is atonal ({voiced_ratio:.1%} "
+                           f"<= {voiced_min:.0%})")
+
+        # Check #4: Harmonic Diversity
+        if chroma_std > chroma_min:
+            details.append(f" [V] Harmonic development found "
+                           f"(chroma_std={chroma_std:.3f} > {chroma_min})")
+        else:
+            details.append(f" [X] No harmonic development "
+                           f"(chroma_std={chroma_std:.3f} "
+                           f"<= {chroma_min})")
 
     # Final Decision
-    if score >= thresholds['decision_score_min']:
+    if score >= thresholds.decision_score_min:
         decision = ">> Verdict: Likely contains music"
     else:
         decision = ">> Verdict: Likely static only"
 
     return decision, score, details
 
-def process_audio_files(file_paths: list, thresholds: dict):
+def _init_worker():
+    """
+    Initializer for the worker processes of the process pool.
+    Limits every worker to a single FFT thread and, when threadpoolctl
+    is installed, a single OpenMP thread (BLAS is limited per analysis,
+    see _analyze_file), so that N workers do not start N x cpu_count
+    threads between them. Environment variables such as
+    OMP_NUM_THREADS would have no effect here, as the native libraries
+    are already loaded.
+    """
+    global _fft_workers
+    _fft_workers = 1
+    if threadpool_limits is not None:
+        threadpool_limits(limits=1, user_api='openmp')
+
+def _positive_int(value: str) -> int:
+    """
+    argparse type for the options that only accept a positive integer.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            f"must be a positive integer, got {value}")
+    return number
+
+def _warm_up():
+    """
+    Runs pitch detection once on a short silent signal, so numba
+    compiles librosa's pYIN kernels before the files are processed
+    instead of during the first one.
+    """
+    librosa.pyin(np.zeros(4096, dtype=np.float32), sr=SAMPLE_RATE,
+                 fmin=PITCH_FMIN, fmax=PITCH_FMAX,
+                 frame_length=PITCH_FRAME_LENGTH)
+
+def format_report(file_path: str, metrics: Metrics,
+                  thresholds: Thresholds, error: str = None,
+                  brief: bool = False) -> str:
+    """
+    Builds the classification report for a single analyzed file.
+    Args:
+        file_path (str): Path to the analyzed audio file.
+        metrics (Metrics): Metrics from analyze_audio_features (None if
+                           the analysis failed).
+        thresholds (Thresholds): The configuration of thresholds.
+        error (str): Error message of a failed analysis.
+        brief (bool): Only report the verdict and score, on one line.
+    Returns:
+        str: The report, ready to be written at once.
+    """
+    name = os.path.basename(file_path)
+    if brief:
+        if metrics is None:
+            return f"{name}: {error}\n"
+        decision, score, _ = classify_audio(metrics, thresholds,
+                                            with_details=False)
+        return f"{name}: {decision} (score {score})\n"
+
+    lines = [f"\nAnalyzed file: {name}"]
+    if error is not None:
+        lines.append(f"  {error}")
+    if metrics is not None:
+        decision, score, details = classify_audio(metrics, thresholds)
+        lines.append("  Detailed Analysis:")
+        for detail in details:
+            lines.append(f"    {detail}")
+        lines.append(f"  Final Score: {score} out of {len(details)}")
+        lines.append(f"  {decision}")
+    return "\n".join(lines) + "\n"
+
+def _open_cache():
+    """
+    Opens the metrics cache at CACHE_PATH, creating it if needed.
+    Returns:
+        sqlite3.Connection: The cache, or None if it cannot be used
+                            (e.g. on a read-only filesystem).
+    """
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        cache = sqlite3.connect(CACHE_PATH)
+        # Caches written before the analysis key existed are dropped.
+        columns = [row[1] for row in
+                   cache.execute("PRAGMA table_info(metrics)")]
+        if columns and 'analysis' not in columns:
+            cache.execute("DROP TABLE metrics")
+        cache.execute("CREATE TABLE IF NOT EXISTS metrics ("
+                      "path TEXT PRIMARY KEY, mtime REAL, size INTEGER, "
+                      "analysis TEXT, complete INTEGER, metrics TEXT)")
+        return cache
+    except (OSError, sqlite3.Error):
+        return None
+
+def _analysis_key(voicing_backend: str) -> str:
+    """
+    Identifies the analysis that computes the metrics: its version, the
+    voicing backend and every constant the metrics depend on.
+    """
+    return repr((ANALYSIS_VERSION, voicing_backend, SAMPLE_RATE, N_FFT,
+                 HOP_LENGTH, ANALYSIS_SECONDS, BLOCK_SECONDS,
+                 BLOCK_OVERLAP_SECONDS, EARLY_EXIT_MIN_SECONDS,
+                 PITCH_FMIN, PITCH_FMAX, PITCH_FRAME_LENGTH))
+
+def _load_cached_metrics(cache, file_path: str, thresholds: Thresholds,
+                         voicing_backend: str) -> Metrics:
+    """
+    Looks up the cached metrics of a file.
+    Metrics of an analysis that stopped early (or skipped pitch
+    detection) are only reused when the current thresholds decide the
+    verdict from them as well. Records that cannot be decoded (e.g.
+    written by a version with other metrics) count as misses.
+    Returns:
+        Metrics: The cached metrics, or None on a cache miss.
+    """
+    try:
+        stat = os.stat(file_path)
+        row = cache.execute(
+            "SELECT mtime, size, analysis, complete, metrics FROM metrics "
+            "WHERE path = ?", (os.path.abspath(file_path),)).fetchone()
+    except (OSError, sqlite3.Error):
+        return None
+
+    if row is None:
+        return None
+    mtime, size, analysis, complete, record = row
+    if (mtime != stat.st_mtime or size != stat.st_size or
+            analysis != _analysis_key(voicing_backend)):
+        return None
+    try:
+        metrics = Metrics(**json.loads(record))
+        if not complete and not _verdict_decided(metrics, thresholds):
+            return None
+    except (ValueError, TypeError):
+        return None
+    return metrics
+
+def _store_cached_metrics(cache, file_path: str, metrics: Metrics,
+                          thresholds: Thresholds, voicing_backend: str):
+    """
+    Stores the metrics of a file in the cache. Failures (e.g. a
+    read-only cache) are ignored.
+    """
+    # The analysis only stops early or skips pitch detection when the
+    # verdict is decided without it.
+    complete = not _verdict_decided(metrics, thresholds)
+    try:
+        stat = os.stat(file_path)
+        with cache:
+            cache.execute(
+                "INSERT OR REPLACE INTO metrics VALUES (?, ?, ?, ?, ?, ?)",
+                (os.path.abspath(file_path), stat.st_mtime, stat.st_size,
+                 _analysis_key(voicing_backend), complete,
+                 json.dumps(asdict(metrics))))
+    except (OSError, sqlite3.Error):
+        pass
+
+def process_audio_files(file_paths: list, thresholds: Thresholds,
+                        max_workers: int = None, chunksize: int = 1,
+                        voicing_backend: str = VOICING_BACKEND,
+                        use_cache: bool = True, blas_threads: int = None,
+                        brief: bool = False):
     """
     Main function to process a list of audio files.
+    Files are analyzed in parallel by a pool of worker processes, each
+    file being fully independent of the others.
     Args:
         file_paths (list): A list of file paths.
-        thresholds (dict): The configuration of thresholds.
+        thresholds (Thresholds): The configuration of thresholds.
+        max_workers (int): Number of worker processes (defaults to the
+                           number of CPU cores).
+        chunksize (int): Number of files sent to a worker at a time.
+        voicing_backend (str): Pitch detection algorithm, one of
+                               VOICING_BACKENDS.
+        use_cache (bool): Reuse and store metrics in the cache at
+                          CACHE_PATH.
+        blas_threads (int): Number of BLAS threads when the files are
+                            analyzed in this process (None keeps the
+                            library default). Worker processes always
+                            use a single BLAS thread.
+        brief (bool): Only report the verdict and score of every file,
+                      on one line.
     """
     if not file_paths:
         print("The list of files to analyze is empty.")
@@ -205,21 +977,65 @@ def process_audio_files(file_paths: list, thresholds: dict):
 
     print("-- Starting Audio Filtering Process ---")
     print(f"Using the following thresholds for decision (requires "
-          f"{thresholds['decision_score_min']} matches):")
-    for key, value in thresholds.items():
-        if key != 'decision_score_min':
-            print(f"  {key}: {value}")
-
-    for file_path in file_paths:
-        metrics = analyze_audio_features(file_path)
-        if metrics:
-            decision, score, details = classify_audio(metrics,
-                                                      thresholds)
-            print("  Detailed Analysis:")
-            for detail in details:
-                print(f"    {detail}")
-            print(f"  Final Score: {score} out of {len(details)}")
-            print(f"  {decision}")
+          f"{thresholds.decision_score_min} matches):")
+    for f in fields(thresholds):
+        if f.name != 'decision_score_min':
+            print(f"  {f.name}: {getattr(thresholds, f.name)}")
+
+    # Files whose metrics are cached are not analyzed again.
+    cache = _open_cache() if use_cache else None
+    cached = {}
+    if cache is not None:
+        for file_path in file_paths:
+            metrics = _load_cached_metrics(cache, file_path, thresholds,
+                                           voicing_backend)
+            if metrics is not None:
+                cached[file_path] = metrics
+    to_analyze = [path for path in file_paths if path not in cached]
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(to_analyze))
+
+    # Compile the pYIN numba kernels once. On Linux the workers are
+    # forked from this process and inherit the compiled kernels.
+    if to_analyze and voicing_backend == 'pyin':
+        _warm_up()
+
+    analyze = partial(_analyze_file, thresholds=thresholds,
+                      voicing_backend=voicing_backend)
+    with ExitStack() as stack:
+        if max_workers > 1:
+            mp_context = None
+            if sys.platform.startswith('linux'):
+                mp_context = multiprocessing.get_context('fork')
+            executor = stack.enter_context(ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=mp_context,
+                initializer=_init_worker))
+            results = executor.map(partial(analyze, blas_threads=1),
+                                   to_analyze, chunksize=chunksize)
+        else:
+            results = map(partial(analyze, blas_threads=blas_threads),
+                          to_analyze)
+
+        # Workers only return the metrics (or an error message); the
+        # report of every file is written here, in the parent, with a
+        # single write, so workers never contend for stdout and
+        # reports never interleave.
+        for file_path in file_paths:
+            error = None
+            if file_path in cached:
+                metrics = cached[file_path]
+            else:
+                metrics, error = next(results)
+                if cache is not None and metrics is not None:
+                    _store_cached_metrics(cache, file_path, metrics,
+                                          thresholds, voicing_backend)
+            sys.stdout.write(format_report(file_path, metrics,
+                                           thresholds, error, brief))
+
+    if cache is not None:
+        cache.close()
 
     print("\n--- Audio Filtering Process Finished ---")
 
@@ -231,65 +1047,107 @@ if __name__ == "__main__":
     #
     #
     ##
-    # Place your MP3/WAV files in the same folder as this script,
-    # or provide the full paths to them.
+    # Pass the paths of your MP3/WAV files on the command line, either
+    # directly or as glob patterns:
+    #
+    #   python static_archeology.py file1.mp3 file2.wav
+    #   python static_archeology.py --glob "archive/**/*.mp3"
+    #
+    # All files are analyzed in a single Python process (pool), so the
+    # librosa import and numba compilation are only paid once.
     # IMPORTANT: To work with MP3 files, you might need to install
     # ffmpeg.
     # Instructions:
     # https://www.geeksforgeeks.org/how-to-install-ffmpeg-on-windows/
     #
-    # For demonstration, we'll create some test WAV files using
-    # the soundfile library. If you don't have it installed, run:
-    #
-    #
-    # pip install soundfile
+    # When no files are given, for demonstration, we'll create some
+    # test WAV files using the soundfile library.
 
-    try:
-        import soundfile as sf
-
-        sr_test = 22050
-        duration_test = 10
-
-        # File #1: Pure noise
-        noise = np.random.randn(sr_test * duration_test) * 0.8
-        sf.write("test_noise_only.wav", noise, sr_test)
-
-        # File #2: Noise + very faint music (sine waves)
-        t = np.linspace(0., duration_test, int(sr_test * \
-                                              duration_test), endpoint=False)
-        tone_melody = (np.sin(2*np.pi*220*t) + \
-                      np.sin(2*np.pi*261*t*1.5) + \
-                      np.sin(2*np.pi*330*t*0.5))
-        music_signal = noise * 0.7 + tone_melody * 0.05 # Music is
-                                                        # very quiet
-        sf.write("test_music_and_noise.wav", music_signal, sr_test)
-
-        # File #3: More prominent music with noise
-        music_signal_stronger = noise * 0.5 + tone_melody * 0.15
-        sf.write("test_music_stronger.wav", music_signal_stronger,
-                  sr_test)
-
-        audio_files_to_check = [
-            "test_noise_only.wav",
-            "test_music_and_noise.wav",
-            "test_music_stronger.wav",
-            "non_existent_file.mp3" # Example of error handling
-        ]
-        print("Test files 'test*.wav' created successfully.")
-
-    except ImportError:
-        print("WARNING: 'soundfile' library not found (pip install "
-              "soundfile).")
-        print("Test files cannot be created. Please specify the paths "
-              "to your files manually.")
-        # REPLACE THIS LIST WITH YOUR FILES
-        audio_files_to_check = [
-            # "C:/path/to/your/file1.mp3",
-            # "radio_archive_part2.wav",
-        ]
-    except Exception as e:
-        print(f"An error occurred while creating test files: {e}")
-        audio_files_to_check = []
+    parser = argparse.ArgumentParser(
+        description="Pre-filter audio recordings with heavy static "
+                    "noise.")
+    parser.add_argument('files', nargs='*',
+                        help="Audio files to analyze.")
+    parser.add_argument('--glob', action='append', default=[],
+                        metavar='PATTERN',
+                        help="Glob pattern of audio files to analyze "
+                             "(can be repeated, '**' is recursive).")
+    parser.add_argument('--max-workers', '--workers', type=_positive_int,
+                        default=None,
+                        help="Number of worker processes (default: "
+                             "number of CPU cores).")
+    parser.add_argument('--chunksize', type=_positive_int, default=1,
+                        help="Number of files sent to a worker at a "
+                             "time (default: 1).")
+    parser.add_argument('--voicing-backend', choices=VOICING_BACKENDS,
+                        default=VOICING_BACKEND,
+                        help="Pitch detection algorithm (default: "
+                             f"{VOICING_BACKEND}).")
+    parser.add_argument('--blas-threads', type=_positive_int, default=None,
+                        help="Number of BLAS threads when files are "
+                             "analyzed in a single process (worker "
+                             "processes always use 1).")
+    parser.add_argument('--brief', action='store_true',
+                        help="Only print the verdict and score of every "
+                             "file, on one line.")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Analyze every file again instead of "
+                             "reusing the cached metrics.")
+    args = parser.parse_args()
+
+    audio_files_to_check = list(args.files)
+    for pattern in args.glob:
+        audio_files_to_check.extend(sorted(glob.glob(pattern,
+                                                     recursive=True)))
+
+    if not args.files and not args.glob:
+        try:
+            sr_test = 22050
+            duration_test = 10
+
+            # A seeded generator keeps the test files identical from
+            # one run to the next; everything stays in float32.
+            rng = np.random.default_rng(0)
+
+            # File #1: Pure noise
+            noise = rng.standard_normal(sr_test * duration_test,
+                                        dtype=np.float32) * 0.8
+            sf.write("test_noise_only.wav", noise, sr_test,
+                     subtype='PCM_16')
+
+            # File #2: Noise + very faint music (sine waves)
+            t = np.linspace(0., duration_test, sr_test * duration_test,
+                            endpoint=False, dtype=np.float32)
+            tone_melody = (np.sin(2*np.pi*220*t) + \
+                          np.sin(2*np.pi*261*t*1.5) + \
+                          np.sin(2*np.pi*330*t*0.5))
+            music_signal = noise * 0.7 + tone_melody * 0.05 # Music is
+                                                            # very quiet
+            sf.write("test_music_and_noise.wav", music_signal, sr_test,
+                     subtype='PCM_16')
+
+            # File #3: More prominent music with noise
+            music_signal_stronger = noise * 0.5 + tone_melody * 0.15
+            sf.write("test_music_stronger.wav", music_signal_stronger,
+                      sr_test, subtype='PCM_16')
+
+            audio_files_to_check = [
+                "test_noise_only.wav",
+                "test_music_and_noise.wav",
+                "test_music_stronger.wav",
+                "non_existent_file.mp3" # Example of error handling
+            ]
+            print("Test files 'test*.wav' created successfully.")
+
+        except Exception as e:
+            print(f"An error occurred while creating test files: {e}")
+            audio_files_to_check = []
 
     #2. RUN THE ANALYSIS
-    process_audio_files(audio_files_to_check, THRESHOLDS)
\ No newline at end of file
+    process_audio_files(audio_files_to_check, THRESHOLDS,
+                        max_workers=args.max_workers,
+                        chunksize=args.chunksize,
+                        voicing_backend=args.voicing_backend,
+                        use_cache=not args.no_cache,
+                        blas_threads=args.blas_threads,
+                        brief=args.brief)
\ No newline at end of file